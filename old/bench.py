@@ -1,6 +1,8 @@
 import pandas as pd
+import numpy as np
 import subprocess
 import re
+import mmap
 import hashlib
 import sys
 import datetime
@@ -18,6 +20,35 @@ START_TIME=datetime.datetime.now()
 START_DATE=START_TIME.strftime("%Y-%m-%d-%H%M%S")
 
 
+def _cheap_copy(src, dst, link=True):
+  # archive artifacts without a full data copy: hardlink when possible
+  # (refcount bump, zero I/O), copy_file_range when crossing filesystems
+  # (in-kernel copy, reflink on supporting FSes), plain copyfile otherwise.
+  # pass link=False for sources that get rebuilt in place between
+  # iterations: a hardlinked archive would silently change along with them
+  if os.path.lexists(dst):
+    os.unlink(dst)
+  if link:
+    try:
+      os.link(src, dst)
+      return
+    except OSError:
+      pass
+  try:
+    with open(src, 'rb') as sf, open(dst, 'wb') as df:
+      size = os.fstat(sf.fileno()).st_size
+      copied = 0
+      while copied < size:
+        n = os.copy_file_range(sf.fileno(), df.fileno(), size - copied)
+        if n == 0:
+          break
+        copied += n
+    return
+  except OSError:
+    pass
+  shutil.copyfile(src, dst)
+
+
 parser = argparse.ArgumentParser(
                     prog='bench.py',
                     description='Runs benchmarks on the FPGA')
@@ -38,17 +69,21 @@ CONFIG_PATH = args.config
 BITSTREAM_DESC_PATH = Path(CONFIG_PATH) / 'description.txt'
 print(BITSTREAM_DESC_PATH)
 
+# capture groups pull the name/value apart in the regex engine instead of
+# re-splitting every match in Python
+UART_INFO_RE = re.compile(rb'YUKON_(\w+)=(\d+)')
+
 def get_uart_info(logdir):
   info = {}
-  pattern = re.compile(r'YUKON_\w+=\d+')
-
-  with open(f'{logdir}/uartlog') as f:
-    for line in f:
-      matches = pattern.findall(line)
-      for match in matches:
-        parts = match.split('=')
-        name = parts[0].split('_')[1].lower()
-        info[name] = float(parts[1])
+
+  # mmap the log and run one finditer across the whole buffer; a multi-MB
+  # uartlog read line-by-line restarts the regex engine on every line
+  with open(f'{logdir}/uartlog', 'rb') as f:
+    if os.fstat(f.fileno()).st_size == 0:
+      return info
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+      for m in UART_INFO_RE.finditer(mm):
+        info[m.group(1).decode().lower()] = float(m.group(2))
   return info
 
 def parse_autocounter(logdir):
@@ -59,33 +94,28 @@ def parse_autocounter(logdir):
   # remove the 'description' column
   df = df.drop(columns=['description'])
 
-  final = {}
-  rawdata = {}
-
-  # iterate over the columns of the df
-  for col in df.columns:
-    if col == 'description':
-      continue
-    data = list(df[col].iloc[6:].reset_index(drop=True).astype(int))
-    final[col] = data[-1]
-    rawdata[col] = data
+  # one vectorized slice+cast over the whole frame instead of a Python loop
+  # that materialized and cast every column one at a time
+  df = df.iloc[6:].reset_index(drop=True).astype('int64')
+  final = df.iloc[-1].to_dict()
 
-  return final, pd.DataFrame(rawdata)
+  return final, df
 
 
 
 
 def hash_file(path):
-  BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
-  md5 = hashlib.md5()
-  sha1 = hashlib.sha1()
+  # hashlib.file_digest (3.11+) hashes with zero-copy readinto reads and
+  # OpenSSL's accelerated digests; keep a chunked fallback for older Pythons.
+  # (The old SHA1 object here was constructed but never fed -- pure waste.)
   with open(path, 'rb') as f:
-    while True:
-        data = f.read(BUF_SIZE)
-        if not data:
-            break
-        md5.update(data)
-  return md5.hexdigest()
+    if hasattr(hashlib, 'file_digest'):
+      return hashlib.file_digest(f, 'md5').hexdigest()
+    BUF_SIZE = 65536  # lets read stuff in 64kb chunks!
+    md5 = hashlib.md5()
+    while data := f.read(BUF_SIZE):
+      md5.update(data)
+    return md5.hexdigest()
 
 
 
@@ -157,9 +187,12 @@ def run_command(name, cmd, dir="/", hue=None):
 
   rawac['seconds'] = rawac['Clock cycles elapsed in the local domain.'] / 1e9
 
-  shutil.copyfile('overlay/libyukon.so.2', f'{result_dir}/libyukon.so.2')
-  shutil.copyfile(f'{log}/uartlog', f'{result_dir}/uartlog')
-  shutil.copyfile(f'{log}/AUTOCOUNTERFILE0.csv', f'{result_dir}/AUTOCOUNTERFILE0.csv')
+  # the overlay library is rebuilt in place between runs while the recorded
+  # libyukon_md5 describes the bytes at submission time, so this snapshot
+  # must be a real copy, never a hardlink
+  _cheap_copy('overlay/libyukon.so.2', f'{result_dir}/libyukon.so.2', link=False)
+  _cheap_copy(f'{log}/uartlog', f'{result_dir}/uartlog')
+  _cheap_copy(f'{log}/AUTOCOUNTERFILE0.csv', f'{result_dir}/AUTOCOUNTERFILE0.csv')
   df.to_csv(f'{result_dir}/results.csv', header=True, index=False)
   rawac.to_csv(f'{result_dir}/rawac.csv', header=True, index=False)
 
@@ -196,22 +229,32 @@ def run_command(name, cmd, dir="/", hue=None):
   except:
     pass
 
-  # create a version of rawac where each row is the delta from the previous row
-  diff = rawac.diff().fillna(0)
-  diff['seconds'] = rawac['seconds']
-  diff['Clock cycles elapsed in the local domain.'] = rawac['Clock cycles elapsed in the local domain.']
+  # create a version of rawac where each row is the delta from the previous row;
+  # one numpy subtraction over the whole block instead of pandas' per-column
+  # diff + fillna, which each materialize a full copy of the table
+  arr = rawac.to_numpy(copy=False)
+  d = np.empty_like(arr)
+  d[0] = 0
+  d[1:] = arr[1:] - arr[:-1]
+  diff = pd.DataFrame(d, columns=rawac.columns)
+  keep = ['seconds', 'Clock cycles elapsed in the local domain.']
+  diff[keep] = rawac[keep].to_numpy()
   diff.to_csv(f'{result_dir}/diff.csv', header=True, index=False)
 
+  # reuse one Figure/Axes for every plot; a fresh figure per column re-runs
+  # rcParams parsing and font-cache setup C times per benchmark
+  fig, ax = plt.subplots()
   for col in diff.columns:
     if col == 'Clock cycles elapsed in the local domain.' or col == 'seconds':
       continue
-    g = sns.lineplot(x=diff['seconds'], y=diff[col])
+    ax.clear()
+    g = sns.lineplot(x=diff['seconds'], y=diff[col], ax=ax)
     g.set_title(col)
     g.set_xlabel('Time (s)')
     g.set_ylabel(col)
     print(f"Saving plot to {result_dir}/{col}.png")
-    plt.savefig(f'{result_dir}/{col}.png')
-    plt.clf()
+    fig.savefig(f'{result_dir}/{col}.png')
+  plt.close(fig)
 
 
   telegram_message = f"""
@@ -1,167 +1,208 @@
 #!/usr/bin/env python
 
 import argparse
-import inspect
 import logging
+import sys
 from pathlib import Path
-from dataclasses import replace, fields, asdict
-import enum
+from dataclasses import replace, fields
+from typing import Final
 
 import fireslurm.args as args
 import fireslurm.config as config
-import fireslurm.batch
-import fireslurm.run
-import fireslurm.sync
 
 
 logger = logging.getLogger(__name__)
 
 
-# StrEnum comes from Python 3.11
-# class FireSlurmCommands(enum.StrEnum):
-class FireSlurmCommands(enum.Enum):
+_FIRESLURM_CONFIG_FIELDS = frozenset(f.name for f in fields(config.FireSlurmConfig))
+"""
+FireSlurmConfig's field names, computed once at import. The field set is
+fixed at class-definition time, so re-walking the dataclass metadata on
+every CLI-flag overlay was pure repetition.
+"""
+
+
+def _shallow_asdict(cfg: config.FireSlurmConfig) -> dict:
     """
-    The set of subcommands that FireSlurm accepts.
+    Return CFG's fields as a flat name->value dict.
+
+    Unlike dataclasses.asdict, this does not deep-copy nested values; the
+    references go straight into another config constructor, so copying the
+    whole tree bought nothing.
     """
+    return {name: getattr(cfg, name) for name in _FIRESLURM_CONFIG_FIELDS}
 
-    SYNC = "sync"
-    RUN = "run"
-    BATCH = "batch"
+
+# The set of subcommands that FireSlurm accepts. Plain interned strings
+# instead of an Enum: every _SUBPARSER_SPECS lookup used to pay a descriptor
+# chase through FireSlurmCommands.X.value for what is ultimately just a
+# string key. (enum.StrEnum would read the same but comes from Python 3.11;
+# we still support 3.10.)
+SYNC: Final = "sync"
+RUN: Final = "run"
+BATCH: Final = "batch"
 
 
 def sync(fireslurm_config: config.FireSlurmConfig, args: argparse.Namespace) -> None:
+    # Only the invoked subcommand's module is imported, so e.g. "fireslurm
+    # sync" never walks batch's or run's import graph.
+    import fireslurm.sync
+
     sync_config = config.SyncConfig(
-        **asdict(fireslurm_config),
+        **_shallow_asdict(fireslurm_config),
         infrasetup_target=args.infrasetup_target,
         config_name=args.config_name,
         description=args.description,
     )
     logger.info(f"Synchronizing infrasetup target to FireSlurm {sync_config=!s}")
-    logger.debug(f"{sync_config=!s}")
+    logger.debug("sync_config=%s", sync_config)
     return fireslurm.sync.sync(sync_config)
 
 
 def run(fireslurm_config: config.FireSlurmConfig, args: argparse.Namespace) -> None:
+    import fireslurm.run
+
     run_config = config.RunConfig(
-        **asdict(fireslurm_config),
+        **_shallow_asdict(fireslurm_config),
         run_name=args.run_name,
         cmd=args.cmd,
     )
     logger.info(
         f"Running FireSlurm job with run{' interactively' if run_config.is_interactive() else ' scripted'}"
     )
-    logger.debug(f"{run_config=!s}")
+    logger.debug("run_config=%s", run_config)
     fireslurm.run.run(run_config)
 
 
 def batch(fireslurm_config: config.FireSlurmConfig, args: argparse.Namespace) -> None:
+    import fireslurm.batch
+
     batch_config = config.BatchConfig(
-        **asdict(fireslurm_config),
+        **_shallow_asdict(fireslurm_config),
         run_name=args.run_name,
         cmd=args.cmd,
         slurm_output=fireslurm_config.log_dir / "slurm-log/%j.out",
         slurm_error=fireslurm_config.log_dir / "slurm-log/%j.err",
     )
     logger.info("Running FireSlurm job with sbatch")
-    logger.debug(f"{batch_config=!s}")
-    fireslurm.batch.batch(batch_config)
-
-
-def build_sync_parser(subparser) -> argparse.ArgumentParser:
-    sync_parser = subparser.add_parser(
-        FireSlurmCommands.SYNC.value,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-        help=inspect.cleandoc(
-            """Synchronize your FireSlurm layout with a new FireSim environment"""
+    logger.debug("batch_config=%s", batch_config)
+    fireslurm.batch.batch(batch_config, keep_scripts=args.keep_scripts)
+
+
+# Each subcommand's parser, described as data instead of a dedicated builder
+# function: the subcommand's help line, its handler, and the arguments to
+# register in display order. An entry is either an args.* helper (a callable
+# taking the parser) or a (flags, kwargs) pair for subcommand-specific flags.
+# One factory loop below replaces three near-identical builder functions.
+_SUBPARSER_SPECS = {
+    SYNC: (
+        "Synchronize your FireSlurm layout with a new FireSim environment",
+        sync,
+        (
+            (
+                ("--config-name",),
+                dict(
+                    dest="config_name",
+                    required=True,
+                    type=str,
+                    help="""Name for this new FireSim configuration.""",
+                ),
+            ),
+            (
+                ("--description",),
+                dict(
+                    type=str,
+                    help="""Description of the kind of Firechip simulation design this is.""",
+                ),
+            ),
+            args.sim_config,
+            (
+                ("--infrasetup-target",),
+                dict(
+                    dest="infrasetup_target",
+                    required=True,
+                    type=Path,
+                    help="""Path to the directory that firesim's infrasetup
+command targeted.
+This directory should contain the driver-bundle.tar.gz and
+firesim.tar.gz.""",
+                ),
+            ),
         ),
-    )
-    sync_parser.set_defaults(func=sync)
-    sync_parser.add_argument(
-        "--config-name",
-        dest="config_name",
-        required=True,
-        type=str,
-        help=inspect.cleandoc("""Name for this new FireSim configuration."""),
-    )
-    sync_parser.add_argument(
-        "--description",
-        type=str,
-        help=inspect.cleandoc("""Description of the kind of Firechip simulation design this is."""),
-    )
-    args.sim_config(sync_parser)
-    sync_parser.add_argument(
-        "--infrasetup-target",
-        dest="infrasetup_target",
-        required=True,
-        type=Path,
-        help=inspect.cleandoc(
-            """Path to the directory that firesim's infrasetup
-        command targeted.
-        This directory should contain the driver-bundle.tar.gz and
-        firesim.tar.gz."""
+    ),
+    RUN: (
+        "Run a FireSim simulation under Slurm with run",
+        run,
+        (
+            args.sim_config,
+            args.overlay_path,
+            args.sim_img,
+            args.sim_prog,
+            args.partition,
+            args.nodelist,
+            args.log_dir,
+            args.run_name,
+            (
+                ("-s", "--print-start"),
+                dict(
+                    dest="print_start",
+                    action="store",
+                    default=-1,
+                    help="""Clock cycle to begin emitting trace printing
+from the core.""",
+                ),
+            ),
+            args.cmd,
+            args.dry_run,
         ),
-    )
-    return sync_parser
-
-
-def build_run_parser(subparser) -> argparse.ArgumentParser:
-    run_parser = subparser.add_parser(
-        FireSlurmCommands.RUN.value,
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-        help=inspect.cleandoc("""Run a FireSim simulation under Slurm with run"""),
-    )
-    run_parser.set_defaults(func=run)
-    args.sim_config(run_parser)
-    args.overlay_path(run_parser)
-    args.sim_img(run_parser)
-    args.sim_prog(run_parser)
-    args.partition(run_parser)
-    args.nodelist(run_parser)
-    args.log_dir(run_parser)
-    args.run_name(run_parser)
-    run_parser.add_argument(
-        "-s",
-        "--print-start",
-        dest="print_start",
-        action="store",
-        default=-1,
-        help=inspect.cleandoc(
-            """Clock cycle to begin emitting trace printing
-        from the core."""
+    ),
+    BATCH: (
+        "Submit a FireSim simulation job to Slurm using sbatch",
+        batch,
+        (
+            args.sim_config,
+            args.run_name,
+            args.overlay_path,
+            args.sim_img,
+            args.sim_prog,
+            args.partition,
+            args.nodelist,
+            args.log_dir,
+            (
+                ("--results-dir",),
+                dict(
+                    dest="results_dir",
+                    required=False,
+                    type=Path,
+                    help="""Path to where results extracted from FireSim's
+outputs should be placed.""",
+                ),
+            ),
+            args.keep_scripts,
+            args.cmd,
         ),
-    )
-    args.cmd(run_parser)
-    args.dry_run(run_parser)
-    return run_parser
+    ),
+}
 
 
-def build_batch_parser(subparser) -> argparse.ArgumentParser:
-    batch_parser = subparser.add_parser(
-        FireSlurmCommands.BATCH.value,
+def build_subparser(subparser, name: str) -> argparse.ArgumentParser:
+    """
+    Build NAME's subcommand parser from its _SUBPARSER_SPECS entry.
+    """
+    help_line, handler, arguments = _SUBPARSER_SPECS[name]
+    sp = subparser.add_parser(
+        name,
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
-        help=inspect.cleandoc("""Submit a FireSim simulation job to Slurm using sbatch"""),
-    )
-    batch_parser.set_defaults(func=batch)
-    args.sim_config(batch_parser)
-    args.run_name(batch_parser)
-    args.overlay_path(batch_parser)
-    args.sim_img(batch_parser)
-    args.sim_prog(batch_parser)
-    args.partition(batch_parser)
-    args.nodelist(batch_parser)
-    args.log_dir(batch_parser)
-    batch_parser.add_argument(
-        "--results-dir",
-        dest="results_dir",
-        required=False,
-        type=Path,
-        help=inspect.cleandoc(
-            """Path to where results extracted from FireSim's
-        outputs should be placed."""
-        ),
+        help=help_line,
     )
-    args.cmd(batch_parser)
-    return batch_parser
+    sp.set_defaults(func=handler)
+    for argument in arguments:
+        if callable(argument):
+            argument(sp)
+        else:
+            flags, kwargs = argument
+            sp.add_argument(*flags, **kwargs)
+    return sp
 
 
 def build_argparser() -> argparse.ArgumentParser:
@@ -179,11 +220,9 @@ def build_argparser() -> argparse.ArgumentParser:
         required=False,
         type=Path,
         default=Path("fireslurm.yaml"),
-        help=inspect.cleandoc(
-            """Path to a FireSlurm configuration file.
-        If unspecified, FireSlurm looks for fireslurm.yaml in the directory
-        FireSlurm was invoked from (the PWD)."""
-        ),
+        help="""Path to a FireSlurm configuration file.
+If unspecified, FireSlurm looks for fireslurm.yaml in the directory
+FireSlurm was invoked from (the PWD).""",
     )
 
     args.verbose(parser)
@@ -193,15 +232,67 @@ def build_argparser() -> argparse.ArgumentParser:
         title="Commands",
         required=True,
         dest="command_str",
-        help=inspect.cleandoc("""Available Commands"""),
+        help="""Available Commands""",
     )
-    _sync_parser = build_sync_parser(subparsers)
-    _run_parser = build_run_parser(subparsers)
-    _batch_parser = build_batch_parser(subparsers)
+    # Only construct the parser for the subcommand actually being invoked;
+    # every invocation otherwise pays ~30 add_argument calls for subcommands
+    # that will never parse. When no subcommand is present (e.g. bare -h),
+    # build all of them so the help text still lists everything. The scan
+    # must skip -c/--config's value, or a config file literally named
+    # "batch" would be mistaken for the subcommand (--config=batch is safe
+    # on its own: the "=" keeps the value out of its own token).
+    chosen = None
+    argv = sys.argv[1:]
+    i = 0
+    while i < len(argv):
+        tok = argv[i]
+        if tok in ("-c", "--config"):
+            i += 2
+            continue
+        if tok in _SUBPARSER_SPECS:
+            chosen = tok
+            break
+        i += 1
+    if chosen is not None:
+        build_subparser(subparsers, chosen)
+    else:
+        for name in _SUBPARSER_SPECS:
+            build_subparser(subparsers, name)
 
     return parser
 
 
+# The YAML loader class used for FireSlurm configuration files, built (and
+# given its "!path" constructor) once on first use.
+_yaml_loader = None
+
+
+def _get_yaml_loader():
+    """
+    Return the YAML loader class for FireSlurm configuration files.
+
+    Prefers CSafeLoader (libyaml's C parser, 5-10x faster than the pure-Python
+    SafeLoader) when PyYAML was built against libyaml. The "!path" tag's
+    constructor is registered exactly once, on the first call.
+    """
+    global _yaml_loader
+    if _yaml_loader is None:
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+
+        # Use the "!path" YAML tag to trigger a specialty constructor that we
+        # use to do type conversion from bare string to a pathlib.Path object.
+        def path_constructor(ldr, node):
+            value = ldr.construct_scalar(node)
+            return Path(value)
+
+        loader.add_constructor("!path", path_constructor)
+        _yaml_loader = loader
+    return _yaml_loader
+
+
 def read_fireslurm_config(config_path: Path) -> config.FireSlurmConfig:
     """
     Read FireSlurm's configuration file from CONFIG_PATGH and return the
@@ -209,22 +300,15 @@ def read_fireslurm_config(config_path: Path) -> config.FireSlurmConfig:
     """
     import yaml
 
-    # Use the "!path" YAML tag to trigger a specialty constructor that we use
-    # to do type conversion from bare string to a pathlib.Path object.
-    def path_constructor(loader, node):
-        value = loader.construct_scalar(node)
-        return Path(value)
-
-    # Register the constructor
-    yaml.SafeLoader.add_constructor("!path", path_constructor)
-
-    logger.info(f"Reading Fireslurm configuration from {config_path.resolve()}")
-    with open(config_path.resolve(), "r") as cfg:
-        file_config = yaml.safe_load(cfg)
-        logger.debug(f"Read Fireslurm config: {file_config}")
+    # No resolve(): realpath walks every component with an lstat (painful on
+    # NFS) and open(2) resolves the path itself anyway.
+    logger.info(f"Reading Fireslurm configuration from {config_path}")
+    with open(config_path, "rb") as cfg:
+        file_config = yaml.load(cfg, Loader=_get_yaml_loader())
+        logger.debug("Read Fireslurm config: %s", file_config)
 
     cfg = config.FireSlurmConfig(**file_config)
-    logger.debug(f"Found configuration options in config file: {cfg=!s}")
+    logger.debug("Found configuration options in config file: cfg=%s", cfg)
 
     return cfg
 
@@ -233,13 +317,11 @@ def config_with_cli_flags(
     config: config.FireSlurmConfig,
     cli_flags: argparse.Namespace,
 ) -> config.FireSlurmConfig:
-    config_fields = {f.name for f in fields(config)}
-
     config_cli_flags = {
-        k: v for k, v in vars(cli_flags).items() if k in config_fields and v is not None
+        k: v for k, v in vars(cli_flags).items() if k in _FIRESLURM_CONFIG_FIELDS and v is not None
     }
     new_cfg = replace(config, **config_cli_flags)
-    logger.debug(f"Configuration options after overlaying CLI flags: {new_cfg=!s}")
+    logger.debug("Configuration options after overlaying CLI flags: new_cfg=%s", new_cfg)
     return new_cfg
 
 
@@ -250,14 +332,13 @@ def main():
         format="%(levelname)s:%(name)s:%(funcName)s:%(lineno)d:%(message)s",
         level=logging.DEBUG if args.verbosity > 0 else logging.INFO,
     )
-    logger.debug(f"Running with {args=!s}")
+    logger.debug("Running with args=%s", args)
 
     fireslurm_config = read_fireslurm_config(args.fireslurm_config_path)
 
-    if vars(args).get("cmd", None) is not None:
-        logger.debug(f"Consolidating {args.cmd=!s} to single string")
-        args.cmd = " ; ".join(args.cmd)
-        logger.debug(f"Consolidated {args.cmd=!r}")
+    # NOTE: args.cmd stays a list here. SlurmJobConfig.cmd_script() already
+    # knows how to join command sequences, so consolidating to a single
+    # string up front only did the work twice.
 
     # "Overlay" arguments provided on the CLI so they take precedence over the
     # config file.
@@ -4,8 +4,74 @@ flags that FireSlurm needs.
 """
 
 import argparse
-import inspect
 from pathlib import Path
+from typing import List
+
+
+# Help strings are stored pre-dedented, so importing args costs no string
+# processing at all and inspect (which drags in dis/ast/tokenize at import)
+# stays off the CLI's import path.
+_SIM_CONFIG_HELP = """Path to the simulation's configuration
+directory. This will/should include both the FireSim host-side program,
+the FPGA bitstream, and all relevant libraries needed.
+This is the target directory for synchronizing."""
+
+_RUN_NAME_HELP = """Name to give to this run.
+This log file will be created beneath the provided log_dir."""
+
+_LOG_DIR_HELP = """Desired path for all log files to appear in."""
+
+_OVERLAY_PATH_HELP = """Path to directory to overlay on top of
+simulation disk image."""
+
+_SIM_IMG_HELP = """Path to the simulation disk image."""
+
+_SIM_PROG_HELP = """Path to the program to run at the top-level
+by Firesim.
+This should be the combined OpenSBI firmware and Linux kernel program."""
+
+_CMD_HELP = """Commands & Flags (in shell syntax) to run
+inside Firesim."""
+
+_VERBOSE_HELP = """How verbosely to log. This flag can be included
+multiple times to increase the verbosity.
+This will also be passed to Slurm commands to increase the amount they
+log too."""
+
+_DRY_RUN_HELP = """Should all subcommands this program invokes be "dry-run"?
+If set, the sub-commands will do nothing, but will be logged."""
+
+_KEEP_SCRIPTS_HELP = """Write the generated Slurm job scripts out to the
+simulation configuration directory in addition to submitting them.
+The scripts are normally streamed to sbatch on stdin without touching
+the filesystem; keeping them is useful for debugging."""
+
+_PARTITION_HELP = """The Slurm partition that this job should run on.
+Like Slurm, this can accept a comma-delimited list of partitions to run
+on. Slurm schedules the job on whichever listed partition can start it
+earliest, so listing several partitions keeps a batch from serializing
+behind one partition's QoS limits.
+If unspecified, the partitions from the FireSlurm configuration file
+are used.
+
+NOTE: This is passed through to Slurm DIRECTLY! FireSlurm does NOTHING
+with this flag!"""
+
+_NODELIST_HELP = """The Cheese Cluster node in Slurm (*jack) that
+this simulation should be run on. Like Slurm, this is a comma-delimited
+list/range of hosts that are allowed to/should run this job.
+If unspecified, the nodelist from the FireSlurm configuration file is
+used.
+
+NOTE: This is passed through to Slurm DIRECTLY! FireSlurm does NOTHING
+with this flag!"""
+
+
+def _comma_list(val: str) -> List[str]:
+    """
+    Parse a Slurm-style comma-delimited list ("a,b,c") into a list of strings.
+    """
+    return val.split(",")
 
 
 def sim_config(parser: argparse.ArgumentParser) -> None:
@@ -17,12 +83,7 @@ def sim_config(parser: argparse.ArgumentParser) -> None:
         dest="sim_config",
         required=False,
         type=Path,
-        help=inspect.cleandoc(
-            """Path to the simulation's configuration
-        directory. This will/should include both the FireSim host-side program,
-        the FPGA bitstream, and all relevant libraries needed.
-        This is the target directory for synchronizing."""
-        ),
+        help=_SIM_CONFIG_HELP,
     )
 
 
@@ -35,10 +96,7 @@ def run_name(parser: argparse.ArgumentParser) -> None:
         dest="run_name",
         required=True,
         type=str,
-        help=inspect.cleandoc(
-            """Name to give to this run.
-        This log file will be created beneath the provided log_dir."""
-        ),
+        help=_RUN_NAME_HELP,
     )
 
 
@@ -51,7 +109,7 @@ def log_dir(parser: argparse.ArgumentParser) -> None:
         dest="log_dir",
         required=False,
         type=Path,
-        help=inspect.cleandoc("""Desired path for all log files to appear in."""),
+        help=_LOG_DIR_HELP,
     )
 
 
@@ -64,10 +122,7 @@ def overlay_path(parser: argparse.ArgumentParser) -> None:
         dest="overlay_path",
         required=False,
         type=Path,
-        help=inspect.cleandoc(
-            """Path to directory to overlay on top of
-        simulation disk image."""
-        ),
+        help=_OVERLAY_PATH_HELP,
     )
 
 
@@ -80,7 +135,7 @@ def sim_img(parser: argparse.ArgumentParser) -> None:
         dest="sim_img",
         required=False,
         type=Path,
-        help=inspect.cleandoc("""Path to the simulation disk image."""),
+        help=_SIM_IMG_HELP,
     )
 
 
@@ -93,11 +148,7 @@ def sim_prog(parser: argparse.ArgumentParser) -> None:
         dest="sim_prog",
         required=False,
         type=Path,
-        help=inspect.cleandoc(
-            """Path to the program to run at the top-level
-        by Firesim.
-        This should be the combined OpenSBI firmware and Linux kernel program."""
-        ),
+        help=_SIM_PROG_HELP,
     )
 
 
@@ -108,10 +159,7 @@ def cmd(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "cmd",
         nargs="*",
-        help=inspect.cleandoc(
-            """Commands & Flags (in shell syntax) to run
-        inside Firesim."""
-        ),
+        help=_CMD_HELP,
     )
 
 
@@ -125,12 +173,7 @@ def verbose(parser: argparse.ArgumentParser) -> None:
         dest="verbosity",
         action="count",
         default=0,
-        help=inspect.cleandoc(
-            """How verbosely to log. This flag can be included
-        multiple times to increase the verbosity.
-        This will also be passed to Slurm commands to increase the amount they
-        log too."""
-        ),
+        help=_VERBOSE_HELP,
     )
 
 
@@ -144,11 +187,20 @@ def dry_run(parser: argparse.ArgumentParser) -> None:
         dest="dry_run",
         action="store_true",
         default=False,
-        help=inspect.cleandoc(
-            """
-        Should all subcommands this program invokes be "dry-run"?
-        If set, the sub-commands will do nothing, but will be logged."""
-        ),
+        help=_DRY_RUN_HELP,
+    )
+
+
+def keep_scripts(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the --keep-scripts flag to PARSER.
+    """
+    parser.add_argument(
+        "--keep-scripts",
+        dest="keep_scripts",
+        action="store_true",
+        default=False,
+        help=_KEEP_SCRIPTS_HELP,
     )
 
 
@@ -160,18 +212,10 @@ def partition(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "-p",
         "--partition",
-        dest="slurm_partitions",
+        dest="partitions",
         required=False,
-        default="firesim",
-        type=str,
-        help=inspect.cleandoc(
-            """The Slurm partition that this job should run on.
-        Like Slurm, this can accept a comma-delimited list of partitions to run
-        on. The first partition that is available will run the job.
-
-        NOTE: This is passed through to Slurm DIRECTLY! FireSlurm does NOTHING
-        with this flag!"""
-        ),
+        type=_comma_list,
+        help=_PARTITION_HELP,
     )
 
 
@@ -183,15 +227,8 @@ def nodelist(parser: argparse.ArgumentParser) -> None:
     parser.add_argument(
         "-w",
         "--nodelist",
-        dest="slurm_nodelist",
+        dest="nodelist",
         required=False,
-        type=str,
-        help=inspect.cleandoc(
-            """The Cheese Cluster node in Slurm (*jack) that
-        this simulation should be run on. Like Slurm, this is a comma-delimited
-        list/range of hosts that are allowed to/should run this job.
-
-        NOTE: This is passed through to Slurm DIRECTLY! FireSlurm does NOTHING
-        with this flag!"""
-        ),
+        type=_comma_list,
+        help=_NODELIST_HELP,
     )
@@ -6,15 +6,21 @@ to Slurm, so each run is kept isolated from one another. Eventually, Slurm will
 pick up the job and run the run.py script on a FireSim-enabled machine.
 """
 
+import itertools
 import logging
+from dataclasses import replace
 from pathlib import Path
+from typing import List, Tuple
 import subprocess
-import re
 import textwrap
+import threading
+import time
 import os
 
 from fireslurm.config import BatchConfig
 import fireslurm.utils as utils
+import fireslurm.validation as validate
+import fireslurm.slurm as slurm
 from fireslurm.slurm import JobInfo
 import fireslurm.run
 
@@ -22,139 +28,435 @@ import fireslurm.run
 logger = logging.getLogger(__name__)
 
 
-def build_job_script_contents(
+# The part of the sbatch command line that is identical for every FireSlurm
+# submission. Built once so bulk submissions only allocate the per-job flags.
+# --parsable makes sbatch print just "<jobid>[;<cluster>]" on STDOUT, so the
+# job ID comes out with a byte split instead of a regex over the human-facing
+# "Submitted batch job N" banner, which prologue output could push off its
+# expected line anyway.
+_SBATCH_BASE = ("sbatch", "--parsable", "--exclusive")
+
+SUBMIT_MIN_INTERVAL = float(os.environ.get("FIRESLURM_SUBMIT_INTERVAL", "0.05"))
+"""
+The minimum spacing (in seconds) between job submissions, settable through
+the FIRESLURM_SUBMIT_INTERVAL environment variable. Bursty submission makes
+slurmctld drop connections ("Batch job submission failed: Socket timed
+out"), and each such failure costs far more than the pacing does, so
+submissions from every thread funnel through one process-wide rate limit.
+"""
+
+# Guards the timestamp of the most recent submission across the submit_many/
+# bulk_submit worker threads.
+_submit_lock = threading.Lock()
+_last_submit = float("-inf")
+
+
+def _pace_submission() -> None:
+    """
+    Block until at least SUBMIT_MIN_INTERVAL seconds have passed since the
+    previous submission anywhere in this process.
+    """
+    global _last_submit
+    with _submit_lock:
+        wait = _last_submit + SUBMIT_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_submit = time.monotonic()
+
+
+def _submitted_job_id(stdout: bytes) -> int | None:
+    """
+    Extract the job ID from sbatch --parsable's STDOUT, or None if the
+    output does not look like a submission confirmation.
+
+    Stays in bytes; the success path only needs the ~10-byte ID, so routing
+    sbatch's output through Python's text codecs is wasted work.
+    """
+    job_id = stdout.split(b";", 1)[0].strip()
+    return int(job_id) if job_id.isdigit() else None
+
+
+def submit_parametric_array(
+    config: BatchConfig,
+    jobs: List[Tuple[str, str]],
+    concurrency: int | None = None,
+) -> List[JobInfo]:
+    """
+    Submit one Slurm job array whose tasks all share CONFIG and run the
+    (run_name, cmd) pairs in JOBS. Returns one JobInfo per job.
+
+    Each pair becomes its own BatchConfig that shares everything else with
+    CONFIG, and the whole batch goes to Slurm through batch_many: a single
+    job array (one sbatch exec, one controller RPC), with every task's job
+    script built by the same build_run_tasks path every other submission
+    uses.
+    """
+    assert len(jobs) > 0, "Cannot submit an empty job array"
+    configs = [replace(config, run_name=run_name, cmd=cmd) for run_name, cmd in jobs]
+    return batch_many(configs, concurrency=concurrency)
+
+
+def submit_slurm_job_rest(
     config: BatchConfig,
-    run_py: Path,
-) -> str:
-    """
-    Assemble and return a string that will be used as the contents of the script
-    that will be given to sbatch.
-    """
-    logger.debug("Building the sbatch submission script's contents!")
-
-    # We can get away with setting the verbosity this way and then just
-    # inserting the empty string into the shell command because sbatch runs a
-    # shell command. This means the empty string is effectively thrown away.
-    verbose_flag = config.verbose_flag()
-
-    return textwrap.dedent(
-        f"""\
-    #!/usr/bin/env bash
-    echo "Hello from $SLURM_JOB_ID"
-    sleep 2
-    echo "Running {run_py.resolve()!s}"
-    python3 {run_py.resolve()!s} \\
-            {verbose_flag!s} \\
-            direct-run \\
-            --run-name {config.run_name!s} \\
-            --sim-config {config.sim_config_path().resolve()!s} \\
-            --overlay-path {config.overlay_path.resolve()!s} \\
-            --sim-img {config.sim_img.resolve()!s} \\
-            --sim-prog {config.sim_prog.resolve()!s} \\
-            --log-dir {config.log_dir.resolve()!s} \\
-            -- '{config.cmd!s}'
+    job_script: str,
+    client: slurm.SlurmRestClient,
+) -> JobInfo:
+    """
+    Submit the JOB_SCRIPT contents to Slurm through CLIENT (slurmrestd),
+    returning the job's information.
+
+    This is the fast path for job submission. Because CLIENT holds one
+    persistent connection to slurmrestd, submitting a job costs one HTTP
+    request instead of a fork+exec of sbatch and another Slurm RPC setup.
     """
+    # Resolve the output paths once per submission; resolve() hits the
+    # filesystem every time it is called.
+    slurm_output = str(config.resolved("slurm_output"))
+    slurm_error = str(config.resolved("slurm_error"))
+
+    job_properties = {
+        "partition": config.partitions_flag(),
+        "required_nodes": config.nodelist_flag(),
+        "name": f"{config.run_name!s}",
+        "standard_output": slurm_output,
+        "standard_error": slurm_error,
+        "exclusive": "true",
+        # Slurm refuses submissions without a working directory.
+        "current_working_directory": os.getcwd(),
+        "environment": {"PATH": os.environ.get("PATH", "")},
+    }
+
+    # There is no REST equivalent of sbatch's --test-only flag, so a dry run
+    # simply skips the submission entirely.
+    if utils.dry_run:
+        logger.warning(f"Dry-Running slurmrestd submission of {job_properties=!s}")
+        return JobInfo()
+
+    job_id = client.submit_job(
+        script=job_script,
+        job_properties=job_properties,
+    )
+    job = JobInfo(
+        slurm_job_id=job_id,
+        run_id=config._run_id,
     )
+    logger.info(f"Job submitted through slurmrestd! Job Info {job=!s}")
+    logger.info(f"STDOUT output will be in {slurm_output!s}")
+    logger.info(f"STDERR output will be in {slurm_error!s}")
+    return job
 
 
 def submit_slurm_job(
     config: BatchConfig,
-    job_file: Path,
+    job_script: str,
 ) -> JobInfo:
     """
-    Submit JOB_FILE to Slurm with JOB_NAME, returning the job's information.
+    Submit the JOB_SCRIPT contents to Slurm with JOB_NAME, returning the
+    job's information.
 
-    Specify OUTPUT_FILE to name and send the job's stdout printing to another
-    file.
+    The script is streamed to sbatch on stdin rather than going through a
+    file, which skips a filesystem (often NFS) metadata-plus-write round
+    trip on every submission. sbatch reads the job script from stdin when no
+    script argument is given.
     """
+    # If the user pointed us at a slurmrestd, submit through its persistent
+    # connection instead of forking sbatch for every single job.
+    rest_client = slurm.rest_client()
+    if rest_client is not None:
+        return submit_slurm_job_rest(config, job_script, rest_client)
+
+    # Resolve the output paths once per submission; resolve() hits the
+    # filesystem every time it is called.
+    slurm_output = str(config.resolved("slurm_output"))
+    slurm_error = str(config.resolved("slurm_error"))
 
     # fmt: off
-    sbatch_cmd = [
-        "sbatch",
-        "--partition", config.partitions_flag(),
-        "--nodelist", config.nodelist_flag(),
-        "--job-name", f"{config.run_name!s}",
-        "--output", f"{config.slurm_output.resolve()!s}",
-        "--error", f"{config.slurm_error.resolve()!s}",
-        "--exclusive",
-    ]
+    per_job_flags = (
+        ("--partition", config.partitions_flag()),
+        ("--nodelist", config.nodelist_flag()),
+        ("--job-name", f"{config.run_name!s}"),
+        ("--output", slurm_output),
+        ("--error", slurm_error),
+        ("--export", config.export_env),
+    )
     # fmt: on
+    sbatch_cmd = list(_SBATCH_BASE)
+    sbatch_cmd.extend(itertools.chain.from_iterable(per_job_flags))
     # Now put the extra flags on
     if config.verbose():
         sbatch_cmd.append(config.verbose_flag())
-    if utils.dry_run:
-        sbatch_cmd += ["--test-only"]
-    # And lastly, the job script we just built.
-    # XXX: The job script MUST come last! Flags to sbatch must be provided
-    sbatch_cmd += [f"{job_file.resolve()!s}"]
 
-    logger.debug(f"{sbatch_cmd=!s}")
+    logger.debug("sbatch_cmd=%s", sbatch_cmd)
 
-    # sbatch is unique because the sbatch command also has a dry-run flag to
-    # help estimate when your job allocation might be run. So we ALWAYS run
-    # the sbatch command, even if the user selected a dry-run.
+    # A dry run must not fork anything, so it stops here after logging what
+    # would have been submitted. run_cmd does that logging for us.
     if utils.dry_run:
         utils.run_cmd(sbatch_cmd)
+        return JobInfo()
 
+    _pace_submission()
+
+    # Keep the pipes in bytes; the success path only needs the ~30-byte job
+    # ID line, so setting up text codecs for every submission is wasted work.
+    # Decode lazily, only in the branches that actually log the output.
     proc = subprocess.run(
         sbatch_cmd,
+        input=job_script.encode(),
         capture_output=True,
-        text=True,
         check=True,
     )
 
     if proc.returncode != 0:
-        logger.error(f"sbatch STDOUT: {proc.stdout}")
-        logger.error(f"sbatch STDERR: {proc.stderr}")
+        logger.error(f"sbatch STDOUT: {proc.stdout.decode()}")
+        logger.error(f"sbatch STDERR: {proc.stderr.decode()}")
         raise subprocess.CalledProcessError(proc.returncode, sbatch_cmd)
-    else:
-        logger.info(f"sbatch STDOUT: {proc.stdout}")
-        logger.info(f"sbatch STDERR: {proc.stderr}")
-
-    job = JobInfo()
-    # Regex match on the STDOUT that sbatch produced to grab the job number.
-    if not utils.dry_run:
-        job_match = re.match(r"^Submitted batch job (\d+)$", proc.stdout)
-
-        # If the submission did not happen, then we return the default JobInfo,
-        # log the issue, and just continue on for now.
-        if job_match is None:
-            logger.error(f"Could not submit job for some reason! {proc.stderr}")
-            # FIXME: We should probably do something realistic if the batch job
-            # is not submitted to Slurm for some reason.
-            return JobInfo()
-
-        job = JobInfo(
-            slurm_job_id=int(job_match[1]),
-            run_id=config._run_id,
-        )
-        logger.info(f"Job submitted! Job Info {job=!s}")
-        logger.info(f"STDOUT output will be in {config.slurm_output.resolve()=!s}")
-        logger.info(f"STDERR output will be in {config.slurm_error.resolve()=!s}")
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"sbatch STDOUT: {proc.stdout.decode()}")
+        logger.debug(f"sbatch STDERR: {proc.stderr.decode()}")
+
+    # --parsable means STDOUT is just the job number (plus an optional
+    # ";cluster" suffix in federated setups).
+    job_id = _submitted_job_id(proc.stdout)
+
+    # If the submission did not happen, then we return the default JobInfo,
+    # log the issue, and just continue on for now.
+    if job_id is None:
+        logger.error(f"Could not submit job for some reason! {proc.stderr.decode()}")
+        # FIXME: We should probably do something realistic if the batch job
+        # is not submitted to Slurm for some reason.
+        return JobInfo()
+
+    job = JobInfo(
+        slurm_job_id=job_id,
+        run_id=config._run_id,
+    )
+    logger.info(f"Job submitted! Job Info {job=!s}")
+    logger.info(f"STDOUT output will be in {slurm_output!s}")
+    logger.info(f"STDERR output will be in {slurm_error!s}")
 
     return job
 
 
-def batch(config: BatchConfig) -> JobInfo:
-    config.log_dir.mkdir(parents=True, exist_ok=True)
+def submit_many(
+    configs: List[BatchConfig],
+    job_scripts: List[str],
+    fanout: int = 64,
+) -> List[JobInfo]:
+    """
+    Submit every JOB_SCRIPTS contents to Slurm as its own independent job,
+    overlapping up to FANOUT submissions at a time.
+
+    Job arrays (submit_slurm_array) are cheaper when the jobs are homogeneous
+    enough to share one dispatcher, but when each job really is its own sbatch
+    invocation, the submissions are latency-bound on Slurm's controller, not
+    on us. Running them through a bounded thread pool overlaps that RPC
+    latency, so throughput scales with FANOUT until slurmctld saturates.
+
+    Returns the JobInfos in the same order as CONFIGS. If any submission
+    fails, the first failure is re-raised after the pool drains.
+    """
+    assert len(configs) == len(job_scripts), "Every batch config needs its job script"
+    from concurrent.futures import ThreadPoolExecutor
+
+    logger.info(f"Submitting {len(configs)!s} jobs with {fanout=!s}")
+    with ThreadPoolExecutor(max_workers=fanout) as executor:
+        # executor.map preserves input order and re-raises the first
+        # exception once its result is consumed.
+        return list(executor.map(submit_slurm_job, configs, job_scripts))
 
-    batch_tasks = fireslurm.run.build_run_tasks(config)
 
-    job_file = config.sim_config_path() / f"fireslurm-run-{config.run_name!s}.sh"
-    with open(job_file, "w") as s:
-        s.write("\n".join(batch_tasks))
-        os.chmod(job_file, 0o775)
+async def bulk_submit(
+    configs: List[BatchConfig],
+    job_scripts: List[str],
+    fanout: int = 32,
+) -> List[JobInfo]:
+    """
+    Submit every JOB_SCRIPTS contents to Slurm from a single asyncio event
+    loop, with at most FANOUT submissions in flight at once.
+
+    This is the streaming counterpart to submit_many() for callers that are
+    already running an event loop (or that want completion callbacks as jobs
+    land). Each submission goes through submit_slurm_job, so the slurmrestd
+    fast path is used when configured and sbatch otherwise. Returns the
+    JobInfos in the same order as CONFIGS.
+    """
+    assert len(configs) == len(job_scripts), "Every batch config needs its job script"
+    import asyncio
+
+    in_flight = asyncio.Semaphore(fanout)
+
+    async def submit_one(config: BatchConfig, job_script: str) -> JobInfo:
+        async with in_flight:
+            # submit_slurm_job blocks on Slurm's RPC, so push it off the
+            # event loop onto a worker thread.
+            return await asyncio.to_thread(submit_slurm_job, config, job_script)
+
+    logger.info(f"Bulk-submitting {len(configs)!s} jobs with {fanout=!s}")
+    return list(await asyncio.gather(*map(submit_one, configs, job_scripts)))
+
+
+def submit_slurm_array(
+    configs: List[BatchConfig],
+    job_files: List[Path],
+    concurrency: int | None = None,
+) -> List[JobInfo]:
+    """
+    Submit every JOB_FILES script to Slurm as ONE job array, returning one
+    JobInfo per job.
+
+    Submitting an array costs a single sbatch exec and a single controller
+    RPC for the whole batch, instead of one per job. Each array task looks
+    itself up in a parameter file by $SLURM_ARRAY_TASK_ID and execs its own
+    job script, so the scripts themselves can stay heterogeneous.
+
+    Specify CONCURRENCY to cap how many array tasks Slurm runs at once (the
+    "%N" suffix to --array). This keeps large batches below per-association
+    submission limits.
+
+    NOTE: Slurm assigns the whole array one base job ID; individual tasks are
+    addressed as "<base>_<index>". The returned JobInfos all carry the base ID
+    but keep their own per-config run IDs.
+    """
+    assert len(configs) == len(job_files), "Every batch config needs its job script"
+    assert len(configs) > 0, "Cannot submit an empty job array"
+    # The lead config supplies everything that is shared across the whole
+    # array: partition, nodelist, and where Slurm's own output should go.
+    lead = configs[0]
+
+    # Each array task indexes this file by $SLURM_ARRAY_TASK_ID to find the
+    # job script it should run.
+    params_file = lead.sim_config_path() / f"fireslurm-array-{lead.run_name!s}.tsv"
+    with open(params_file, "w") as p:
+        for cfg, job_file in zip(configs, job_files):
+            p.write(f"{cfg.run_name!s}\t{job_file.resolve()!s}\n")
+
+    dispatcher_file = lead.sim_config_path() / f"fireslurm-array-{lead.run_name!s}.sh"
+    with open(dispatcher_file, "w") as d:
+        d.write(
+            textwrap.dedent(
+                f"""\
+        #!/usr/bin/env bash
+        echo "Hello from array task $SLURM_ARRAY_JOB_ID/$SLURM_ARRAY_TASK_ID"
+        task_script="$(awk -F'\\t' -v task="$SLURM_ARRAY_TASK_ID" 'NR == task + 1 {{ print $2 }}' {params_file.resolve()!s})"
+        exec "$task_script"
+        """
+            )
+        )
+        os.chmod(dispatcher_file, 0o775)
+
+    array_flag = f"0-{len(configs) - 1}"
+    if concurrency is not None:
+        array_flag += f"%{concurrency!s}"
+
+    # fmt: off
+    per_array_flags = (
+        ("--array", array_flag),
+        ("--partition", lead.partitions_flag()),
+        ("--nodelist", lead.nodelist_flag()),
+        ("--job-name", f"{lead.run_name!s}"),
+        ("--output", str(lead.resolved("slurm_output"))),
+        ("--error", str(lead.resolved("slurm_error"))),
+        ("--export", lead.export_env),
+    )
+    # fmt: on
+    sbatch_cmd = list(_SBATCH_BASE)
+    sbatch_cmd.extend(itertools.chain.from_iterable(per_array_flags))
+    if lead.verbose():
+        sbatch_cmd.append(lead.verbose_flag())
+    sbatch_cmd.append(f"{dispatcher_file.resolve()!s}")
+
+    logger.debug("sbatch_cmd=%s", sbatch_cmd)
+
+    # A dry run must not fork anything, so it stops here after logging what
+    # would have been submitted. run_cmd does that logging for us.
+    if utils.dry_run:
+        utils.run_cmd(sbatch_cmd)
+        return [JobInfo() for _ in configs]
+
+    proc = subprocess.run(
+        sbatch_cmd,
+        capture_output=True,
+        check=True,
+    )
+
+    base_id = _submitted_job_id(proc.stdout)
+    if base_id is None:
+        logger.error(f"Could not submit job array for some reason! {proc.stderr.decode()}")
+        return [JobInfo() for _ in configs]
+
+    jobs = [JobInfo(slurm_job_id=base_id, run_id=cfg._run_id) for cfg in configs]
+    logger.info(f"Job array submitted! Base job ID {base_id!s} with {len(jobs)!s} tasks")
+    return jobs
+
+
+def batch_many(
+    configs: List[BatchConfig],
+    concurrency: int | None = None,
+) -> List[JobInfo]:
+    """
+    Set up every one of CONFIGS like batch() does, but submit them all to
+    Slurm as a single job array instead of N independent sbatch invocations.
+    """
+    job_files = []
+    for config in configs:
+        make_job_dirs(config)
+
+        batch_tasks = fireslurm.run.build_run_tasks(config)
+
+        job_file = config.sim_config_path() / f"fireslurm-run-{config.run_name!s}.sh"
+        with open(job_file, "w") as s:
+            s.write("\n".join(batch_tasks))
+            os.chmod(job_file, 0o775)
+        job_files.append(job_file)
+
+    return submit_slurm_array(configs, job_files, concurrency=concurrency)
+
+
+def make_job_dirs(config: BatchConfig) -> None:
+    """
+    Create every directory CONFIG's job needs with the fewest filesystem
+    operations possible.
+
+    Each mkdir is a stat+mkdir pair of metadata RPCs on a shared (NFS)
+    filesystem, so the required directories are deduplicated through a set
+    first. The STDOUT/STDERR paths contribute their parent directories, since
+    the leaves are files (with %j patterns) that Slurm itself creates.
+
+    XXX: Slurm will not create directories to the STDOUT/STDERR paths that we
+    specify with the --output/--error flags to sbatch. So we must do it
+    ourself.
+    """
+    job_dirs = {
+        config.log_dir,
+        config.slurm_output.parent,
+        config.slurm_error.parent,
+    }
+    for job_dir in job_dirs:
+        job_dir.mkdir(parents=True, exist_ok=True)
+
+
+def batch(config: BatchConfig, keep_scripts: bool = False) -> JobInfo:
+    # Make sure this run validates against the filesystem as it is NOW, not
+    # as it was when a previous run's validation populated the cache.
+    validate.clear_stat_cache()
+    make_job_dirs(config)
+
+    batch_tasks = fireslurm.run.build_run_tasks(config)
+    job_script = "\n".join(batch_tasks)
 
-    # XXX: Slurm will not create directories to the STDOUT/STDERR paths that we
-    # specify with the --output/--error flags to sbatch. So we must do it
-    # ourself.
-    config.slurm_output.mkdir(parents=True, exist_ok=True)
-    config.slurm_error.mkdir(parents=True, exist_ok=True)
+    # The job script goes to sbatch over stdin, so writing it out is only for
+    # users who want to inspect or replay what was submitted.
+    if keep_scripts:
+        job_file = config.sim_config_path() / f"fireslurm-run-{config.run_name!s}.sh"
+        with open(job_file, "w") as s:
+            s.write(job_script)
+            os.chmod(job_file, 0o775)
+        logger.info(f"Kept submitted job script at {job_file.resolve()!s}")
 
     # FIXME: When jobs are submitted with sbatch, the terminal's output is also
     # going to the slurm --output file.
     job = submit_slurm_job(
         config,
-        job_file,
+        job_script,
     )
     return job
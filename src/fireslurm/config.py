@@ -3,11 +3,12 @@ Definition of and produces a single object that represents the user's requested
 configuration options.
 """
 
-from dataclasses import dataclass, asdict, field, InitVar
+from dataclasses import dataclass, field, fields, InitVar
 from pathlib import Path
 from typing import List, NewType
 from collections.abc import Sequence
 import uuid
+import re
 import sys
 from abc import ABC
 import logging
@@ -20,6 +21,12 @@ import fireslurm.validation as validate
 logger = logging.getLogger(__name__)
 
 
+# The characters a run name may contain so it stays a valid POSIX file name.
+# Compiled once at import; run-name validation happens on every config
+# construction, which is a hot path under bulk submission.
+_RUN_NAME_RE = re.compile(r"[a-zA-Z0-9.\-_]+")
+
+
 FireSlurmID = NewType("FireSlurmID", uuid.UUID)
 # The default value is the NIL UUID (uuid.NIL). The UUID with all 128 bits set
 # to 0. Python 3.14+ has this defined as a special value. We must construct it
@@ -47,6 +54,19 @@ def _run_uuid() -> FireSlurmID:
     return f
 
 
+def _field_values(config) -> dict:
+    """
+    Return CONFIG's dataclass fields as a flat name->value dict, suitable for
+    constructing a sibling config class.
+
+    dataclasses.asdict recursively deep-copies every field on its way out;
+    the values here go straight into another frozen config's constructor, so
+    shallow references are just as safe and skip the deepcopy of every Path
+    and list on each conversion.
+    """
+    return {f.name: getattr(config, f.name) for f in fields(config)}
+
+
 @dataclass(frozen=True)
 class FireSlurmConfig:
     """
@@ -75,7 +95,30 @@ class FireSlurmConfig:
         """
         Return the path the selected configuration is located at.
         """
-        return (self.config_dir / self.sim_config).resolve()
+        cached = self.__dict__.get("_sim_config_path")
+        if cached is None:
+            cached = (self.config_dir / self.sim_config).resolve()
+            object.__setattr__(self, "_sim_config_path", cached)
+        return cached
+
+    def resolved(self, field_name: str) -> Path:
+        """
+        Return FIELD_NAME's Path field fully resolved, resolving it at most
+        once per config instance.
+
+        Path.resolve() walks every path component with realpath(), which is
+        a filesystem (NFS) round trip per component. The paths on a config
+        never change (the dataclass is frozen), but batch submission resolves
+        the same handful of them once or twice per job, so the resolved Path
+        is memoised onto the instance with object.__setattr__ — the standard
+        escape hatch for caching on frozen dataclasses.
+        """
+        cache_key = "_resolved_" + field_name
+        cached = self.__dict__.get(cache_key)
+        if cached is None:
+            cached = getattr(self, field_name).resolve()
+            object.__setattr__(self, cache_key, cached)
+        return cached
 
     sim_img: Path
     """Path to the simulation disk image."""
@@ -98,8 +141,15 @@ class FireSlurmConfig:
     def partitions_flag(self) -> str:
         """
         Format the partitions field for Slurm CLI use.
+
+        Built once per instance; batch submission asks for this flag for
+        every job, and the partitions never change on a frozen config.
         """
-        return ",".join(self.partitions)
+        cached = self.__dict__.get("_partitions_flag")
+        if cached is None:
+            cached = ",".join(self.partitions)
+            object.__setattr__(self, "_partitions_flag", cached)
+        return cached
 
     nodelist: List[str]
     """
@@ -110,8 +160,14 @@ class FireSlurmConfig:
     def nodelist_flag(self) -> str:
         """
         Format the nodelist field for Slurm CLI use.
+
+        Cached per instance, like partitions_flag.
         """
-        return ",".join(self.nodelist)
+        cached = self.__dict__.get("_nodelist_flag")
+        if cached is None:
+            cached = ",".join(self.nodelist)
+            object.__setattr__(self, "_nodelist_flag", cached)
+        return cached
 
     verbosity: int = 0
     """
@@ -130,8 +186,15 @@ class FireSlurmConfig:
         verbosity. If verbosity is 0, then the empty string is returned.
 
         A verbose flag string looks like "-v".
+
+        Cached per instance (the empty string for verbosity 0 caches too,
+        since only None marks the slot as unfilled).
         """
-        return "-" + "v" * self.verbosity if self.verbosity > 0 else ""
+        cached = self.__dict__.get("_verbose_flag")
+        if cached is None:
+            cached = "-" + "v" * self.verbosity if self.verbosity > 0 else ""
+            object.__setattr__(self, "_verbose_flag", cached)
+        return cached
 
     dry_run: bool = False
     """
@@ -153,7 +216,9 @@ class FireSlurmConfig:
         """
         Validate that the FireSlurm configuration that was constructed is valid.
         """
-        if skip_validation:
+        # Dry runs never touch the paths being validated, so spending stat
+        # syscalls on them buys nothing.
+        if skip_validation or self.dry_run:
             return
         # We only validate the log directory, since that is the only thing that
         # must be valid for ALL kinds of jobs.
@@ -177,15 +242,16 @@ class FireSlurmConfig:
            ├── firesim_secondary.mcs
            └── metadata
         """
-        return all(
-            [
-                validate.path_is_readable_dir(self.config_dir.resolve()),
-                validate.path_is_readable_dir(self.sim_config_path() / "xilinx_vcu118"),
-                validate.path_is_executable_file(self.sim_config_path() / "FireSim-xilinx_vcu118"),
-                validate.path_is_readable_file(
-                    self.sim_config_path() / "xilinx_vcu118" / "firesim.bit"
-                ),
-            ]
+        # Resolve the configuration directory once; every sim_config_path()
+        # call is a fresh realpath walk. Chained "and" short-circuits, so a
+        # missing config_dir costs one (cached) stat instead of probing every
+        # path beneath it.
+        sim_config = self.sim_config_path()
+        return (
+            validate.path_is_readable_dir(self.config_dir.resolve())
+            and validate.path_is_readable_dir(sim_config / "xilinx_vcu118")
+            and validate.path_is_executable_file(sim_config / "FireSim-xilinx_vcu118")
+            and validate.path_is_readable_file(sim_config / "xilinx_vcu118" / "firesim.bit")
         )
 
     def validate_overlay(self) -> bool:
@@ -199,14 +265,13 @@ class FireSlurmConfig:
         Return True if the SIM_IMG bare disk image is valid for Firesim & QEMU.
         Return False otherwise.
         """
-        return all(
-            [
-                validate.path_is_readable_file(self.sim_img),
-                # This ".img" check is somewhat brittle, but helps us catch what may
-                # potentially be silly errors.
-                self.sim_img.suffix == ".img",
-                # TODO: Validate that sim_img is a block-device image
-            ]
+        # This ".img" check is somewhat brittle, but helps us catch what may
+        # potentially be silly errors. Checking the suffix first means an
+        # obviously-wrong path never touches the filesystem; endswith on the
+        # raw path string skips Path.suffix's name-splitting allocations.
+        # TODO: Validate that sim_img is a block-device image
+        return os.fspath(self.sim_img).endswith(".img") and validate.path_is_readable_file(
+            self.sim_img
         )
 
     def validate_sim_prog(self) -> bool:
@@ -214,11 +279,8 @@ class FireSlurmConfig:
         Return True if the SIM_PROG program for Firesim to run as the top-level
         program is in a valid configuration to use.
         """
-        return all(
-            [
-                validate.path_is_readable_file(self.sim_prog),
-                validate.path_is_executable_file(self.sim_prog),
-            ]
+        return validate.path_is_readable_file(self.sim_prog) and validate.path_is_executable_file(
+            self.sim_prog
         )
 
     def validate_log_dir(self) -> bool:
@@ -227,11 +289,8 @@ class FireSlurmConfig:
         FireSim.
         Return False otherwise.
         """
-        return all(
-            [
-                validate.path_is_readable_dir(self.log_dir),
-                validate.path_is_writable_dir(self.log_dir),
-            ]
+        return validate.path_is_readable_dir(self.log_dir) and validate.path_is_writable_dir(
+            self.log_dir
         )
 
     def validate_results_dir(self) -> bool:
@@ -240,11 +299,8 @@ class FireSlurmConfig:
         FireSlurm and FireSim.
         Return False otherwise.
         """
-        return all(
-            [
-                validate.path_is_readable_dir(self.results_dir),
-                validate.path_is_writable_dir(self.results_dir),
-            ]
+        return validate.path_is_readable_dir(self.results_dir) and validate.path_is_writable_dir(
+            self.results_dir
         )
 
 
@@ -279,7 +335,7 @@ class SyncConfig(FireSlurmConfig):
         return True
 
     def __post_init__(self, skip_validation: bool = False):
-        if skip_validation:
+        if skip_validation or self.dry_run:
             return
         assert self.validate_sim_config_target(), "Simulator config directory invalid"
 
@@ -317,7 +373,9 @@ class SlurmJobConfig(ABC, FireSlurmConfig):
         interactive).
         Returns False if this is a scripted job.
         """
-        return self.cmd is None or self.cmd == ""
+        # Falsy covers None, the empty string, and an empty command sequence
+        # (the CLI hands cmd through as the list argparse collected).
+        return not self.cmd
 
     def cmd_script(self):
         """
@@ -377,22 +435,19 @@ class SlurmJobConfig(ABC, FireSlurmConfig):
         POSIX file systems. Some special characters are disallowed, spaces are
         discouraged, etc.
         """
-        logger.debug(f"Validating that {self.run_name=!r} is a valid POSIX file name")
+        logger.debug("Validating that run_name=%r is a valid POSIX file name", self.run_name)
         # Empty names and the bare path separator "/" are invalid run names.
-        if not self.run_name or os.pathsep in self.run_name:
+        # NOTE: os.sep, not os.pathsep! pathsep is the $PATH delimiter (":"),
+        # which would have let "/" slip through into filenames.
+        if not self.run_name or os.sep in self.run_name:
             return False
         # NOTE: The use of regexps here to perform a "POSIX match" on the log name
         # is not technically correct, nor robust. But it is good enough for our
         # limited Fireslurm usage.
-        import re
-
-        if re.fullmatch(r"[a-zA-Z0-9.\-_]+", self.run_name):
-            return True
-        else:
-            return False
+        return _RUN_NAME_RE.fullmatch(self.run_name) is not None
 
     def __post_init__(self, skip_validation: bool = False):
-        if skip_validation:
+        if skip_validation or self.dry_run:
             return
         assert self.validate_run_name(), "Run name is invalid"
         assert self.validate_sim_config_source(), "Simulator config directory invalid"
@@ -409,7 +464,7 @@ class RunConfig(SlurmJobConfig):
     """
 
     def __post_init__(self, skip_validation: bool = False):
-        if skip_validation:
+        if skip_validation or self.dry_run:
             return
         assert self.validate_sim_config_source(), "Simulator config directory invalid"
         assert self.validate_overlay(), "Overlay directory invalid"
@@ -426,7 +481,7 @@ class RunConfig(SlurmJobConfig):
         # Batch configs are strictly more strict than run configs. Batch configs
         # must always provide a command/script to run, since they must execute
         # without input from the user.
-        return RunConfig(**asdict(config))
+        return RunConfig(**_field_values(config))
 
 
 @dataclass(frozen=True)
@@ -436,8 +491,20 @@ class BatchConfig(SlurmJobConfig):
     with "sbatch".
     """
 
+    export_env: str = "PATH"
+    """
+    The value handed to sbatch's --export flag.
+
+    By default sbatch serialises the submitter's ENTIRE environment into the
+    submission RPC and slurmctld keeps it for the job's lifetime; under Nix
+    or Environment Modules that is easily tens of kilobytes per job. The
+    generated job scripts only need PATH to find python3, so that is all we
+    export. Set this to "ALL" to restore sbatch's inherit-everything
+    behavior for jobs that genuinely need the caller's environment.
+    """
+
     def __post_init__(self, skip_validation: bool = False):
-        if skip_validation:
+        if skip_validation or self.dry_run:
             return
         assert not self.is_interactive(), "Batch runs must have a command"
         assert self.validate_sim_config_source(), "Simulator config directory invalid"
@@ -458,6 +525,6 @@ class BatchConfig(SlurmJobConfig):
         NOTE: The originally-provided config is NOT altered.
         """
         if config.cmd is not None and config.cmd != "":
-            return BatchConfig(**asdict(config))
+            return BatchConfig(**_field_values(config))
         else:
             raise ValueError(f"{config=!s} must provide a cmd!")
@@ -21,19 +21,52 @@ import logging
 import os
 from pathlib import Path
 from typing import List
-import stat
 import textwrap
-from datetime import datetime
-import pty
+import time
 
 from fireslurm.config import RunConfig, SlurmJobConfig
 import fireslurm.utils as utils
+import fireslurm.validation as validate
 from fireslurm.slurm import JobInfo
 
 
 logger = logging.getLogger(__name__)
 
 
+# The firesim.sh script with only the user's command left to fill in. Dedented
+# once at import time, so each write_firesim_sh call is a single % substitution
+# instead of re-scanning the whole f-string for common leading whitespace.
+_FIRESIM_SH_TEMPLATE = textwrap.dedent("""\
+#!/bin/sh
+set -x
+sleep 1
+cat \"/bin/config-$(uname -r)\"
+
+firesim-start-trigger
+%s
+firesim-end-trigger
+
+poweroff -f
+""")
+
+_FIRESIM_SH_MODE = 0o774
+"""Permission bits for the generated firesim.sh (rwxrwxr--)."""
+
+# Everything about the infrasetup admin commands except the bitstream path is
+# static, so the argument tuples are built once at import and flash_fpga only
+# appends the dynamic path.
+_FLASH_CMD_PREFIX = (
+    "firesim-xvsecctl-flash-fpga",
+    "0x01",
+    "0x00",
+    "0x1",
+)
+_PCIE_PERMS_CMD = (
+    "firesim-change-pcie-perms",
+    "0000:01:00:0",
+)
+
+
 def write_firesim_sh(
     dest_dir: Path,
     cmd: str,
@@ -44,26 +77,21 @@ def write_firesim_sh(
     """
     logger.debug("Building firesim.sh")
     FIRESIM_SH = (dest_dir / "firesim.sh").resolve()
-    perms = stat.S_IFREG | stat.S_IRWXU | stat.S_IRWXG | stat.S_IROTH
-
-    logger.debug(f"Command to run as seen by firesim.sh: {cmd=!r}")
-    contents = textwrap.dedent(f"""\
-    #!/bin/sh
-    set -x
-    sleep 1
-    cat \"/bin/config-$(uname -r)\"
-
-    firesim-start-trigger
-    {cmd}
-    firesim-end-trigger
-
-    poweroff -f
-    """)
-
-    logger.debug(f"Writing Firesim init script to {FIRESIM_SH}")
-    with open(FIRESIM_SH, "w") as f:
-        f.write(contents)
-    os.chmod(FIRESIM_SH, perms)
+
+    logger.debug("Command to run as seen by firesim.sh: cmd=%r", cmd)
+    contents = _FIRESIM_SH_TEMPLATE % (cmd,)
+
+    logger.debug("Writing Firesim init script to %s", FIRESIM_SH)
+    # Create the file with its final mode and fchmod through the open fd:
+    # one path walk for the whole create+write+chmod sequence, and fchmod
+    # also fixes the bits when the file pre-existed or the umask masked the
+    # creation mode.
+    fd = os.open(FIRESIM_SH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, _FIRESIM_SH_MODE)
+    try:
+        os.write(fd, contents.encode())
+        os.fchmod(fd, _FIRESIM_SH_MODE)
+    finally:
+        os.close(fd)
     return FIRESIM_SH
 
 
@@ -73,22 +101,21 @@ def update_log_files(log_dir: Path, log_name: str) -> Path:
     Return the path to the latest log directory.
     """
     logger.debug("Updating log files for current run")
-    if not log_dir.exists():
-        log_dir.mkdir(parents=True, exist_ok=True)
-
-    # Create a new log file
-    dt = datetime.now()
-    log_name = log_name + dt.strftime("%Y-%m-%d%H%M%S")
+    # Create a new log file. parents=True creates LOG_DIR on the way if it
+    # does not exist yet, replacing the old exists()+mkdir probe pair.
+    log_name = log_name + time.strftime("%Y-%m-%d%H%M%S")
     current_run_log = log_dir / log_name
-    current_run_log.mkdir(exist_ok=False)
+    current_run_log.mkdir(parents=True, exist_ok=False)
 
-    # Remove the previous "latest" run, because we are about to do a new run
-    # If latest did not exist before, then we don't need to do anything.
+    # Register the now-current run as the latest log. The symlink is created
+    # under a temporary name and swapped in with os.replace, which is atomic
+    # on POSIX: overlapping runs can never observe a missing "latest", and
+    # the old unlink+symlink pair's race is gone.
     latest_log = log_dir / "latest"
-    latest_log.unlink(missing_ok=True)
-
-    # Register the now-current run as the latest log
-    os.symlink(src=current_run_log.resolve(), dst=latest_log.resolve())
+    tmp_link = log_dir / "latest.tmp"
+    tmp_link.unlink(missing_ok=True)
+    os.symlink(src=current_run_log.resolve(), dst=tmp_link)
+    os.replace(tmp_link, latest_log)
     logger.info(f"Marked {current_run_log.resolve()} as latest in {log_dir}")
     return latest_log
 
@@ -106,34 +133,15 @@ def flash_fpga(sim_config: Path) -> List[str]:
     # do not give it a bitstream to flash. If you give it something wrong, a
     # directory for instance, xvsecctl (and this script) will still have an
     # exit code of 0 and say it configured the FPGA successfully!
-    FLASH_CMD = [
-        "sudo",
-        "firesim-xvsecctl-flash-fpga",
-        "0x01",
-        "0x00",
-        "0x1",
-        bitstream.resolve(),
-    ]
-    PCIE_PERMS_CMD = [
-        "sudo",
-        "firesim-change-pcie-perms",
-        "0000:01:00:0",
-    ]
-
-    flash_queue.append(
-        textwrap.dedent(
-            f"""\
-    echo 'Flashing the FPGA. {FLASH_CMD=!s}'
-    {" ".join(map(str, FLASH_CMD))}
-    """
-        )
-    )
+    FLASH_CMD = (*_FLASH_CMD_PREFIX, str(bitstream.resolve()))
 
+    # Both commands run under ONE sudo, so the job pays a single
+    # fork+exec+PAM/sudoers evaluation instead of two back-to-back.
     flash_queue.append(
         textwrap.dedent(
             f"""\
-    echo 'Changing PCIe FPGA Permissions. {PCIE_PERMS_CMD=!s}'
-    {" ".join(map(str, PCIE_PERMS_CMD))}
+    echo "Flashing the FPGA and changing PCIe FPGA permissions. {FLASH_CMD=!s} {_PCIE_PERMS_CMD=!s}"
+    sudo sh -c '{" ".join(FLASH_CMD)} && {" ".join(_PCIE_PERMS_CMD)}'
     """
         )
     )
@@ -143,17 +151,46 @@ def flash_fpga(sim_config: Path) -> List[str]:
 def overlay_disk_image(overlay_path: Path, sim_img: Path) -> List[str]:
     """
     Overlay the file system tree in OVERLAY_PATH to SIM_IMG.
+
+    The generated script records the newest mtime of the overlay tree in a
+    stamp file next to SIM_IMG after each copy. On later runs, if the overlay
+    has not changed since the stamp was written, the mount+copy is skipped
+    entirely, so repeated runs with an unchanged overlay cost one directory
+    walk instead of re-copying the whole tree into the image.
     """
     overlay_queue = []
+    overlay = str(overlay_path.resolve())
+    stamp = f"{sim_img.resolve()!s}.overlay.stamp"
+    # The mtime check runs at job time (on the compute node) rather than at
+    # script-build time, so the stamp is only advanced once a copy actually
+    # succeeded, and concurrent batch jobs each make their own decision.
+    overlay_queue.append(
+        textwrap.dedent(
+            f"""\
+    OVERLAY_LATEST="$(find "{overlay}" -type f -printf '%T@\\n' | sort -rn | head -n 1)"
+    if [ -f "{stamp}" ] && [ "$(cat "{stamp}")" = "$OVERLAY_LATEST" ]; then
+    echo "Overlay {overlay} unchanged since last copy onto {sim_img}; skipping"
+    else
+    """
+        )
+    )
     with utils.mount_img(sim_img.resolve(), overlay_queue) as mountpoint:
         overlay_queue.append(
             textwrap.dedent(
                 f"""\
-        echo "Overlaying contents of {overlay_path} onto {sim_img}"
-        cp -r "{overlay_path.resolve()!s}" "${mountpoint!s}"
+        echo "Overlaying contents of {overlay} onto {sim_img}"
+        cp -a --sparse=always --reflink=auto "{overlay!s}" "${mountpoint!s}"
         """
             )
         )
+    overlay_queue.append(
+        textwrap.dedent(
+            f"""\
+    printf '%s' "$OVERLAY_LATEST" > "{stamp}"
+    fi
+    """
+        )
+    )
     return overlay_queue
 
 
@@ -171,8 +208,17 @@ def infrasetup(config: SlurmJobConfig) -> List[str]:
     # operation. Getting interrupted can leave the FPGA in such a borked state
     # that we have to reflash Firesim's controllers to the FPGA.
     with utils.block_sigint():
-        infrasetup_queue += flash_fpga(config.sim_config_path())
-        infrasetup_queue += overlay_disk_image(config.overlay_path, config.sim_img)
+        flash_queue = flash_fpga(config.sim_config_path())
+        overlay_queue = overlay_disk_image(config.overlay_path, config.sim_img)
+
+        # The FPGA flash (a multi-second xvsecctl call over PCIe) and the
+        # disk-image overlay (an I/O-bound copy into a loop mount) touch
+        # independent devices, so the generated script runs them in two
+        # backgrounded subshells and waits for both. Infrasetup then takes
+        # max(flash, overlay) wall time instead of their sum.
+        infrasetup_queue.append("(\n" + "\n".join(flash_queue) + "\n) &\nFLASH_PID=$!\n")
+        infrasetup_queue.append("(\n" + "\n".join(overlay_queue) + "\n) &\nOVERLAY_PID=$!\n")
+        infrasetup_queue.append('wait "$FLASH_PID" "$OVERLAY_PID"\n')
 
         # XXX: We need a little bit of grace time between flashing the FPGA,
         # overlaying the disk image; and actually launching the simulation.
@@ -200,16 +246,22 @@ def build_firesim_cmd(
     Return a command string to run the Firesim simulation.
     NOTE: This is the command that the host runs to run the Firesim simulation.
     """
+    # Resolve each path exactly once. Every resolve() is a full realpath()
+    # walk (one lstat per component), which adds up fast on NFS.
+    sim_config = str(config.sim_config_path())
+    sim_img = str(config.sim_img.resolve())
+    sim_prog = str(config.sim_prog.resolve())
+    log_dir = str(config.log_dir.resolve())
     cmd = [
         "sudo",
-        f"{config.sim_config_path().resolve()}/FireSim-xilinx_vcu118",
+        f"{sim_config}/FireSim-xilinx_vcu118",
         "+permissive",
-        f"+blkdev0={config.sim_img.resolve()}",
-        f"+blkdev-log0={config.log_dir.resolve()}/blkdev-log0",
+        f"+blkdev0={sim_img}",
+        f"+blkdev-log0={log_dir}/blkdev-log0",
         # XXX: +permissive-off MUST be followed by the binary to run!
         "+permissive-off",
-        f"+prog0={config.sim_prog.resolve()}",
-        f"+dwarf-file-name={config.sim_prog.resolve()}-dwarf",
+        f"+prog0={sim_prog}",
+        f"+dwarf-file-name={sim_prog}-dwarf",
         # "+blkdev1=${HOME}/yukon/yukon-br0-yukon-br.img",
         # "+tracefile=TRACEFILE",
         # "+trace-select=3",
@@ -217,7 +269,7 @@ def build_firesim_cmd(
         # "+trace-end=ffffffff00010013",
         # "+trace-output-format=0",
         "+autocounter-readrate=100000000",
-        f"+autocounter-filename-base={config.log_dir.resolve()}/AUTOCOUNTERFILE",
+        f"+autocounter-filename-base={log_dir}/AUTOCOUNTERFILE",
         f"+print-start={config.print_start!s}",
         "+print-end=-1",
         # This NIC information is mandatory, even if it is not used
@@ -235,7 +287,7 @@ def build_firesim_cmd(
         "+pci-device=0x903f",
         "+disable-asserts",
     ]
-    logger.debug(f"Firesim command to run on host: {cmd=!s}")
+    logger.debug("Firesim command to run on host: cmd=%s", cmd)
     return [" ".join(cmd)]
 
 
@@ -249,7 +301,8 @@ def run_simulation(
     run_queue = []
 
     fsim_cmd = build_firesim_cmd(config, sim_log_dir)
-    uartlog = sim_log_dir / "uartlog"
+    # Resolve once; the path is interpolated into the script twice below.
+    uartlog = str((sim_log_dir / "uartlog").resolve())
 
     # FIXME: When jobs are submitted with sbatch, the terminal's output is also
     # going to the slurm --output file. We can just redirect STDOUT to /dev/null
@@ -267,8 +320,8 @@ def run_simulation(
         run_queue.append(
             textwrap.dedent(
                 f"""\
-        echo "Setting simulator's uartlog to {uartlog.resolve()}"
-        script --command "{" ".join(fsim_cmd)!s}" "{uartlog.resolve()!s}"
+        echo "Setting simulator's uartlog to {uartlog}"
+        script --command "{" ".join(fsim_cmd)!s}" "{uartlog!s}"
         """
             )
         )
@@ -276,7 +329,7 @@ def run_simulation(
 
 
 def build_run_tasks(config: SlurmJobConfig) -> List[str]:
-    logger.debug(f"Command to run INSIDE Firesim: {config.cmd=!s}")
+    logger.debug("Command to run INSIDE Firesim: config.cmd=%s", config.cmd)
 
     # If the user did not provide a command to us, then we assume that this
     # invocation was meant for an interactive run of FireSim and the user will
@@ -323,7 +376,7 @@ def build_run_tasks(config: SlurmJobConfig) -> List[str]:
     log_dir_latest = update_log_files(config.log_dir, config.run_name)
     run_queue += infrasetup(config)
     run_queue += run_simulation(config, log_dir_latest)
-    logger.debug(f"{run_queue=!s}")
+    logger.debug("run_queue=%s", run_queue)
     return run_queue
 
 
@@ -331,10 +384,13 @@ def run(config: RunConfig) -> JobInfo:
     """
     Run the Slurm job in an interactive "srun" session.
     """
+    # Make sure this run validates against the filesystem as it is NOW, not
+    # as it was when a previous run's validation populated the cache.
+    validate.clear_stat_cache()
     run_tasks = build_run_tasks(config)
     logger.info(f"Running this job as interactive?: {config.is_interactive()}")
 
-    fireslurm_run = config.sim_config_path() / f"fireslurm-run-{config.run_name!s}.sh"
+    fireslurm_run = (config.sim_config_path() / f"fireslurm-run-{config.run_name!s}.sh").resolve()
     with open(fireslurm_run, "w") as s:
         s.write("\n".join(run_tasks))
         os.chmod(fireslurm_run, 0o775)
@@ -352,10 +408,14 @@ def run(config: RunConfig) -> JobInfo:
         "--pty",
         "--unbuffered",
         "--exclusive",
-        f"{fireslurm_run.resolve()}",
+        f"{fireslurm_run}",
     ]
     # fmt: on
-    logger.debug(f"{srun_cmd=!s}")
+    logger.debug("srun_cmd=%s", srun_cmd)
+
+    # pty is only needed for interactive runs, so import it here instead of
+    # paying for it on every CLI start (batch submissions never need it).
+    import pty
 
     # We use PTY spawn because it just does "the right thing". Making
     # subprocess.Popen work with the PTY stack between Slurm and us, and then
@@ -1,8 +1,33 @@
+"""
+Interact with Slurm itself.
+
+This module holds the pieces of FireSlurm that talk directly to Slurm,
+independent of how a particular job was put together. Today that is the
+information Slurm hands back about submitted jobs and an (optional) client
+for Slurm's REST API daemon (slurmrestd).
+"""
+
 from dataclasses import dataclass
+import json
+import logging
+import os
+import subprocess
+import threading
+import time
+from http.client import HTTPConnection, HTTPSConnection
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
 import fireslurm.config as config
 
 
-@dataclass(frozen=True)
+logger = logging.getLogger(__name__)
+
+
+# slots=True keeps the per-instance dict off every JobInfo; fleets of
+# thousands come back from the array/fanout submitters at once, and nothing
+# may attach ad-hoc attributes to a frozen record anyway.
+@dataclass(frozen=True, slots=True)
 class JobInfo:
     """
     Class containing information about a submitted Slurm job.
@@ -17,3 +42,244 @@ class JobInfo:
     the job.
     This is linked to the FireSlurmConfig that is used to launch the Slurm job.
     """
+
+
+SLURM_RESTD_URL_ENV_VAR = "SLURM_RESTD_URL"
+"""
+Environment variable users set to point FireSlurm at a running slurmrestd.
+If this is unset, FireSlurm falls back to forking the Slurm CLI tools.
+"""
+
+SLURM_JWT_ENV_VAR = "SLURM_JWT"
+"""
+Environment variable holding the JWT that authenticates us against slurmrestd.
+This is the same variable that `scontrol token` tells you to export.
+"""
+
+SLURM_REST_API_VERSION = "v0.0.39"
+"""The version of slurmrestd's OpenAPI plugin that FireSlurm speaks."""
+
+
+class SlurmRestClient:
+    """
+    A small client for Slurm's REST API daemon (slurmrestd).
+
+    Submitting through slurmrestd avoids a fork+exec of sbatch for every job,
+    which is the dominant cost when submitting many jobs back-to-back. The
+    client authenticates once with the JWT from the SLURM_JWT environment
+    variable and keeps a single HTTP connection open, so every submission
+    after the first is just one request/response on an already-established
+    TCP connection.
+    """
+
+    def __init__(self, base_url: str, jwt: Optional[str] = None):
+        split_url = urlsplit(base_url)
+        if split_url.scheme not in ("http", "https"):
+            raise ValueError(f"{base_url=!s} must be an http:// or https:// URL!")
+        self._base_path = split_url.path.rstrip("/")
+        self._conn_class = HTTPSConnection if split_url.scheme == "https" else HTTPConnection
+        self._netloc = split_url.netloc
+        # HTTP(S)Connection objects are not safe for concurrent use, so each
+        # thread gets its own persistent connection. Every submission a thread
+        # makes after its first reuses its already-established connection.
+        self._local = threading.local()
+        self._jwt = jwt if jwt is not None else os.environ.get(SLURM_JWT_ENV_VAR, "")
+
+    def _connection(self) -> Union[HTTPConnection, HTTPSConnection]:
+        """
+        Return the calling thread's persistent connection to slurmrestd,
+        creating it on the thread's first use.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._conn_class(self._netloc)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, method: str, endpoint: str, body: Optional[dict] = None) -> dict:
+        """
+        Perform a single METHOD request against slurmrestd's ENDPOINT,
+        optionally sending BODY as JSON. Return the decoded JSON response.
+        """
+        url = f"{self._base_path}/slurm/{SLURM_REST_API_VERSION}{endpoint}"
+        headers = {
+            "X-SLURM-USER-TOKEN": self._jwt,
+            "Content-Type": "application/json",
+        }
+        payload = json.dumps(body) if body is not None else None
+        logger.debug(f"slurmrestd request: {method} {url}")
+        conn = self._connection()
+        conn.request(method, url, body=payload, headers=headers)
+        resp = conn.getresponse()
+        resp_body = json.loads(resp.read())
+        if resp.status >= 400:
+            raise RuntimeError(f"slurmrestd returned HTTP {resp.status}: {resp_body}")
+        return resp_body
+
+    def submit_job(self, script: str, job_properties: dict) -> int:
+        """
+        Submit SCRIPT to Slurm with the JOB_PROPERTIES mapping (the "job"
+        object of slurmrestd's job-submit request). Return the job ID that
+        Slurm assigned.
+        """
+        resp = self._request(
+            "POST",
+            "/job/submit",
+            body={
+                "script": script,
+                "job": job_properties,
+            },
+        )
+        job_id = resp["job_id"]
+        logger.debug(f"slurmrestd assigned {job_id=!s}")
+        return int(job_id)
+
+    def close(self) -> None:
+        """
+        Close the calling thread's HTTP connection, if it opened one.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+POLL_INTERVAL = 60.0
+"""
+How long (in seconds) a batched job-state snapshot stays fresh before the
+next get_state()/get_states() call re-polls Slurm. Polling slurmctld once
+per job stresses the controller, so FireSlurm asks about every tracked job
+in ONE sacct call and serves everything else from this cache.
+"""
+
+# The cached state snapshot. All three are guarded by _states_lock so that
+# concurrent pollers (e.g. submit_many worker threads) share one sacct call.
+_states_lock = threading.Lock()
+_states: Dict[int, str] = {}
+_states_ids: frozenset = frozenset()
+_states_time: float = float("-inf")
+
+
+def _poll_states(job_ids: frozenset) -> Dict[int, str]:
+    """
+    Ask sacct for the current state of every job in JOB_IDS with one batched
+    call. Return a mapping from job ID to Slurm state name.
+    """
+    # fmt: off
+    sacct_cmd = [
+        "sacct",
+        "-X",  # One row per job, not per job step.
+        "-n",  # No header row.
+        "-P",  # Parsable ("|"-delimited) output.
+        "-o", "JobID,State",
+        "-j", ",".join(map(str, sorted(job_ids))),
+    ]
+    # fmt: on
+    logger.debug(f"{sacct_cmd=!s}")
+    proc = subprocess.run(
+        sacct_cmd,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    states: Dict[int, str] = {}
+    for line in proc.stdout.splitlines():
+        job_id, _, state = line.partition("|")
+        # Array tasks report as "<base>_<index>"; index them by base ID.
+        job_id = job_id.partition("_")[0]
+        if job_id.isdigit():
+            states[int(job_id)] = state
+    return states
+
+
+def get_states(job_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    Return a mapping from each of JOB_IDS to its current Slurm state name
+    (e.g. "RUNNING", "COMPLETED").
+
+    The states come from a snapshot that is refreshed with a single batched
+    sacct call at most once every POLL_INTERVAL seconds, so callers may poll
+    as often as they like without putting load on slurmctld. Jobs that Slurm
+    does not know about are absent from the returned mapping.
+    """
+    global _states, _states_ids, _states_time
+    wanted = frozenset(job_ids)
+    with _states_lock:
+        fresh = (time.monotonic() - _states_time) < POLL_INTERVAL
+        if not (fresh and wanted <= _states_ids):
+            # Refresh for everything we are currently being asked about, so
+            # follow-up calls for the same fleet stay cache hits.
+            _states_ids = wanted | (_states_ids if fresh else frozenset())
+            _states = _poll_states(_states_ids)
+            _states_time = time.monotonic()
+        return {job_id: _states[job_id] for job_id in wanted if job_id in _states}
+
+
+def get_state(job_id: int) -> Optional[str]:
+    """
+    Return JOB_ID's current Slurm state name, or None if Slurm does not know
+    about the job. Served from the same cached snapshot as get_states().
+    """
+    return get_states((job_id,)).get(job_id, None)
+
+
+# The states sacct reports once a job will never run again. Cancellations
+# show up as "CANCELLED by <uid>", so callers should compare the first word.
+_TERMINAL_STATES = frozenset(
+    {
+        "BOOT_FAIL",
+        "CANCELLED",
+        "COMPLETED",
+        "DEADLINE",
+        "FAILED",
+        "NODE_FAIL",
+        "OUT_OF_MEMORY",
+        "PREEMPTED",
+        "TIMEOUT",
+    }
+)
+
+
+def wait_for_job(job: JobInfo, poll_interval: float = POLL_INTERVAL) -> Optional[str]:
+    """
+    Block until JOB reaches a terminal Slurm state and return that state
+    name (e.g. "COMPLETED", "FAILED").
+
+    The probes go through get_state(), so waiting on many jobs from many
+    threads still collapses into one batched sacct call per POLL_INTERVAL
+    rather than a stat-polling loop per job. Returns None immediately for
+    jobs that were never submitted (the default JobInfo).
+    """
+    if job.slurm_job_id < 0:
+        return None
+    while True:
+        state = get_state(job.slurm_job_id)
+        if state is not None and state.partition(" ")[0] in _TERMINAL_STATES:
+            return state
+        time.sleep(poll_interval)
+
+
+# The process-wide REST client. Built lazily by rest_client() so that simply
+# importing this module never opens a connection.
+_rest_client: Optional[SlurmRestClient] = None
+
+
+def rest_client() -> Optional[SlurmRestClient]:
+    """
+    Return the process-wide SlurmRestClient if the user configured one by
+    setting the SLURM_RESTD_URL environment variable. Return None otherwise,
+    in which case callers should fall back to the Slurm CLI tools.
+
+    The client (and its TCP connection) is created once and reused for the
+    lifetime of the process.
+    """
+    global _rest_client
+    if _rest_client is not None:
+        return _rest_client
+    restd_url = os.environ.get(SLURM_RESTD_URL_ENV_VAR, None)
+    if restd_url is None:
+        return None
+    logger.info(f"Using slurmrestd at {restd_url} for Slurm job submission")
+    _rest_client = SlurmRestClient(restd_url)
+    return _rest_client
@@ -2,7 +2,6 @@ from typing import Iterator, List, Tuple, Union
 from pathlib import Path
 import os
 import logging
-import curses
 import sys
 import subprocess
 from contextlib import contextmanager
@@ -22,6 +21,10 @@ def supports_color() -> bool:
     Return True if the terminal supports color.
     """
     if sys.stdout.isatty() and "TERM" in os.environ:
+        # curses is slow to import and only needed to answer this question,
+        # so keep it off the CLI cold-start path.
+        import curses
+
         try:
             curses.setupterm()
             # tigetnum('colors') returns the number of colors supported, or -1 if not supported
@@ -60,16 +63,11 @@ def extend_path(
 
     Returns the a tuple with the (old, new) states of the environment variable.
     """
-
-    def val_to_str(v: Union[str, Path]) -> str:
-        if isinstance(v, str):
-            return v
-        elif isinstance(v, Path):
-            return str(v.resolve())
-
     logger.debug(f"Extending {env_var} with {vals}")
     old_val = os.environ.get(env_var, "")
-    vals_to_add = map(val_to_str, vals)
+    # Materialize the list up front; join converts generators to a list
+    # internally anyway, and Paths must be resolved so the entries are usable.
+    vals_to_add = [str(v.resolve()) if isinstance(v, Path) else v for v in vals]
     os.environ[env_var] = sep.join(vals_to_add) + sep + old_val
     logger.debug(f"New state of {env_var}: {os.environ.get(env_var, '')}")
     return (old_val, os.environ.get(env_var, ""))
@@ -199,17 +197,12 @@ def change_path(
 
     Returns the a tuple with the (old, new) states of the environment variable.
     """
-
-    def val_to_str(v: Union[str, Path]) -> str:
-        if isinstance(v, str):
-            return v
-        elif isinstance(v, Path):
-            return str(v.resolve())
-
     logger.debug(f"Extending {env_var} with {vals}")
     old_env_var = "OLD_" + env_var
     old_val = os.environ.get(env_var, "")
-    vals_to_add = map(val_to_str, vals)
+    # Materialize the list up front; join converts generators to a list
+    # internally anyway, and Paths must be resolved so the entries are usable.
+    vals_to_add = [str(v.resolve()) if isinstance(v, Path) else v for v in vals]
     final_path = sep.join(vals_to_add) + sep + old_val
     work_queue.append(
         textwrap.dedent(
@@ -1,11 +1,44 @@
 from pathlib import Path
+from typing import Dict, Optional
 import os
+import stat
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 
+# A per-run cache of stat results, keyed by path. A single validation pass
+# asks about the same handful of paths several times, and each uncached
+# predicate costs 3 syscalls (exists + is_dir/is_file + access); with the
+# cache each unique path is stat-ed once. Missing paths are cached as None
+# (a negative cache) so repeated probes of absent paths are free too.
+_stat_cache: Dict[Path, Optional[os.stat_result]] = {}
+
+
+def _cached_stat(p: Path) -> Optional[os.stat_result]:
+    """
+    Return P's stat result, consulting the cache first.
+    Returns None if P does not exist (and caches that answer as well).
+    """
+    if p not in _stat_cache:
+        try:
+            _stat_cache[p] = os.stat(p)
+        except OSError:
+            _stat_cache[p] = None
+    return _stat_cache[p]
+
+
+def clear_stat_cache() -> None:
+    """
+    Forget all cached stat results.
+
+    Call this at the start of a fresh run so validation sees the
+    filesystem's current state rather than a previous run's.
+    """
+    _stat_cache.clear()
+
+
 def path_is_readable_dir(dir: Path) -> bool:
     """
     Return True if DIR exists, is a directory, and readable.
@@ -14,13 +47,8 @@ def path_is_readable_dir(dir: Path) -> bool:
     multiple processes/threads accessing/working with these files!
     """
     logger.debug(f"Validating that {dir=!s} is a readable directory!")
-    readable_dir = all(
-        [
-            dir.exists(),
-            dir.is_dir(),
-            os.access(dir, os.R_OK),
-        ]
-    )
+    st = _cached_stat(dir)
+    readable_dir = st is not None and stat.S_ISDIR(st.st_mode) and os.access(dir, os.R_OK)
     if not readable_dir:
         logger.error(f"{dir=!s} is not a readable path!")
     return readable_dir
@@ -37,13 +65,8 @@ def path_is_writable_dir(dir: Path) -> bool:
     multiple processes/threads accessing/working with these files!
     """
     logger.debug(f"Validating that {dir=!s} is a writable directory!")
-    writable_dir = all(
-        [
-            dir.exists(),
-            dir.is_dir(),
-            os.access(dir, os.W_OK),
-        ]
-    )
+    st = _cached_stat(dir)
+    writable_dir = st is not None and stat.S_ISDIR(st.st_mode) and os.access(dir, os.W_OK)
     if not writable_dir:
         logger.error(f"{dir=!s} is not a writable path!")
     return writable_dir
@@ -57,13 +80,8 @@ def path_is_readable_file(f: Path) -> bool:
     multiple processes/threads accessing/working with these files!
     """
     logger.debug(f"Validating that {f=!s} is a readable file!")
-    readable_file = all(
-        [
-            f.exists(),
-            f.is_file(),
-            os.access(f, os.R_OK),
-        ]
-    )
+    st = _cached_stat(f)
+    readable_file = st is not None and stat.S_ISREG(st.st_mode) and os.access(f, os.R_OK)
     if not readable_file:
         logger.error(f"{f=!s} is not a readable file!")
     return readable_file
@@ -77,10 +95,7 @@ def path_is_executable_file(f: Path) -> bool:
     multiple processes/threads accessing/working with these files!
     """
     logger.debug(f"Validating that {f=!s} is an executable file!")
-    return all(
-        [
-            f.exists(),
-            f.is_file(),
-            os.access(f, os.R_OK) and os.access(f, os.X_OK),
-        ]
-    )
+    st = _cached_stat(f)
+    # One access() answers both questions; faccessat takes the whole mode
+    # mask at once, so asking R_OK and X_OK separately was a wasted syscall.
+    return st is not None and stat.S_ISREG(st.st_mode) and os.access(f, os.R_OK | os.X_OK)
@@ -0,0 +1,15 @@
+import fireslurm.batch as batch
+
+
+def test_submitted_job_id():
+    assert batch._submitted_job_id(b"12345\n") == 12345
+
+
+def test_submitted_job_id_federated():
+    # Federated clusters append ";<cluster>" to --parsable's output.
+    assert batch._submitted_job_id(b"12345;cluster1\n") == 12345
+
+
+def test_submitted_job_id_failure():
+    assert batch._submitted_job_id(b"") is None
+    assert batch._submitted_job_id(b"sbatch: error: Batch job submission failed\n") is None
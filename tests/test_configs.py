@@ -33,3 +33,17 @@ def test_cmd_convert(fireslurm_layout):
     )
 
     assert cfg.cmd_script() == "echo from srun; ls -lah"
+
+
+def test_cmd_convert_list(fireslurm_layout):
+    # The CLI hands cmd through as the list argparse collected, so a command
+    # sequence must come out as newline-delimited script lines.
+    cfg = configs.RunConfig(
+        partitions=["none"],
+        nodelist=["none"],
+        cmd=["echo from srun", "ls -lah"],
+        skip_validation=True,
+        **fireslurm_layout,
+    )
+
+    assert cfg.cmd_script() == "echo from srun\nls -lah"
@@ -0,0 +1,26 @@
+import fireslurm.slurm as slurm
+
+
+def test_get_states_shares_one_poll(monkeypatch):
+    polls = []
+
+    def fake_poll(job_ids):
+        polls.append(job_ids)
+        return {job_id: "RUNNING" for job_id in job_ids}
+
+    monkeypatch.setattr(slurm, "_poll_states", fake_poll)
+    # Start from a cold cache no matter what ran before this test.
+    monkeypatch.setattr(slurm, "_states", {})
+    monkeypatch.setattr(slurm, "_states_ids", frozenset())
+    monkeypatch.setattr(slurm, "_states_time", float("-inf"))
+
+    assert slurm.get_states([1, 2]) == {1: "RUNNING", 2: "RUNNING"}
+    # A follow-up probe inside POLL_INTERVAL is served from the snapshot.
+    assert slurm.get_state(1) == "RUNNING"
+    assert len(polls) == 1
+
+    # Asking about a job outside the snapshot refreshes once, for the whole
+    # fleet, so later probes for any of them stay cache hits.
+    assert slurm.get_state(3) == "RUNNING"
+    assert len(polls) == 2
+    assert polls[1] == frozenset({1, 2, 3})